@@ -0,0 +1,84 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Cython build of the spreading kernel.
+
+Mirrors ``nce.engine._spread_loop`` (same arguments, same return tuple) for
+deployments where Numba is unavailable.  Build with
+``python setup.py build_ext --inplace``.
+"""
+
+import numpy as np
+
+
+def spread(
+    const double[::1] act_in,
+    const int[::1] src,
+    const int[::1] tgt,
+    const double[::1] w_exc,
+    const double[::1] w_inh,
+    int steps,
+    double decay,
+    double threshold,
+    double[::1] updates,
+    bint record,
+):
+    """Run *steps* spreading steps; see ``nce.engine`` for the contract."""
+    cdef Py_ssize_t n = act_in.shape[0]
+    cdef Py_ssize_t m = src.shape[0]
+    cdef Py_ssize_t node_cap = steps * n if record else 0
+    cdef Py_ssize_t edge_cap = steps * m if record else 0
+    cdef Py_ssize_t i, e, nn = 0, ne = 0
+    cdef long long traversed = 0
+    cdef int s
+    cdef double df = 1.0
+    cdef double a, v
+
+    act_arr = np.array(act_in, dtype=np.float64)
+    node_step_arr = np.empty(node_cap, dtype=np.int32)
+    node_idx_arr = np.empty(node_cap, dtype=np.int32)
+    node_act_arr = np.empty(node_cap, dtype=np.float64)
+    edge_step_arr = np.empty(edge_cap, dtype=np.int32)
+    edge_idx_arr = np.empty(edge_cap, dtype=np.int32)
+
+    cdef double[::1] act = act_arr
+    cdef int[::1] node_step = node_step_arr
+    cdef int[::1] node_idx = node_idx_arr
+    cdef double[::1] node_act = node_act_arr
+    cdef int[::1] edge_step = edge_step_arr
+    cdef int[::1] edge_idx = edge_idx_arr
+
+    for s in range(steps):
+        updates[:] = 0.0
+
+        if record:
+            for i in range(n):
+                if act[i] > threshold:
+                    node_step[nn] = s
+                    node_idx[nn] = <int>i
+                    node_act[nn] = act[i]
+                    nn += 1
+
+        for e in range(m):
+            a = act[src[e]]
+            if a > threshold:
+                updates[tgt[e]] += a * w_exc[e] * df + a * w_inh[e]
+                traversed += 1
+                if record:
+                    edge_step[ne] = s
+                    edge_idx[ne] = <int>e
+                    ne += 1
+
+        for i in range(n):
+            v = act[i] + updates[i]
+            act[i] = 0.0 if v < 0.0 else (1.0 if v > 1.0 else v)
+
+        df *= decay
+
+    return (
+        act_arr,
+        traversed,
+        node_step_arr[:nn],
+        node_idx_arr[:nn],
+        node_act_arr[:nn],
+        edge_step_arr[:ne],
+        edge_idx_arr[:ne],
+    )
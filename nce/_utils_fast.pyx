@@ -0,0 +1,43 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""Cython record writers for ``ThoughtTrace``'s ring buffers.
+
+``put_node`` / ``put_edge`` store one record straight into the structured
+NumPy buffers used by ``nce.utils`` (same field layout as ``_NODE_DTYPE``
+and ``_EDGE_DTYPE``), skipping NumPy's tuple-to-record conversion.
+No dtype or layout checks are made: callers pass only a trace's own
+C-contiguous buffers.  ``nce.utils`` falls back to plain item assignment
+when this module is not built.  Build with ``python setup.py build_ext --inplace``.
+"""
+
+cimport numpy as cnp
+
+cnp.import_array()
+
+
+cdef packed struct NodeRec:
+    int step
+    int nid
+    double act
+
+cdef packed struct EdgeRec:
+    int step
+    int src
+    int dst
+    double w
+
+
+def put_node(cnp.ndarray buf, Py_ssize_t n, int step, int nid, double act):
+    """Write node record number *n* into ring buffer *buf*."""
+    cdef NodeRec* r = <NodeRec*>cnp.PyArray_DATA(buf) + n % cnp.PyArray_DIM(buf, 0)
+    r.step = step
+    r.nid = nid
+    r.act = act
+
+
+def put_edge(cnp.ndarray buf, Py_ssize_t n, int step, int src, int dst, double w):
+    """Write edge record number *n* into ring buffer *buf*."""
+    cdef EdgeRec* r = <EdgeRec*>cnp.PyArray_DATA(buf) + n % cnp.PyArray_DIM(buf, 0)
+    r.step = step
+    r.src = src
+    r.dst = dst
+    r.w = w
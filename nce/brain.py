@@ -8,8 +8,14 @@ The .brain format is a UTF-8 text file with three sections:
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from nce.utils import iter_lines, split_fields
 
 
 # ── Data structures ──────────────────────────────────────────────────────────
@@ -40,10 +46,18 @@ class ResponseRule:
     trigger_concepts: List[str] = field(default_factory=list)
     intent: str = ""
     priority: int = 0
+    # trigger concepts as indices into BrainGraph.activation (set by finalize)
+    trigger_idx: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
 
 
 class BrainGraph:
-    """In-memory representation of a parsed .brain file."""
+    """In-memory representation of a parsed .brain file.
+
+    Besides the object view (``nodes`` / ``edges`` / ``adjacency``) the graph
+    keeps a Structure-of-Arrays view built by :meth:`finalize`.  The engine
+    works on ``activation`` directly; ``Node.activation`` is only refreshed
+    by :meth:`sync_nodes`.
+    """
 
     def __init__(self) -> None:
         self.nodes: Dict[str, Node] = {}
@@ -51,6 +65,34 @@ class BrainGraph:
         # pre-built adjacency list: source_id -> [Edge, …]
         self.adjacency: Dict[str, List[Edge]] = {}
         self.responses: List[ResponseRule] = []
+        # node_id -> label, maintained by add_node; exposed read-only
+        self._labels: Dict[str, str] = {}
+        self.labels: Mapping[str, str] = MappingProxyType(self._labels)
+
+        # ── SoA view (populated by finalize) ─────────────────────────────
+        # node index -> node id, and the reverse mapping
+        self.node_ids: Tuple[str, ...] = ()
+        self.node_index: Dict[str, int] = {}
+        # current and resting activation per node index
+        self.activation: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.base_activation: np.ndarray = np.zeros(0, dtype=np.float64)
+        # edges in CSR order (grouped by source node, adjacency order)
+        self.edge_order: List[Edge] = []
+        self.edge_src: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.edge_tgt: np.ndarray = np.zeros(0, dtype=np.int32)
+        # excitatory: weight; inhibitory: |weight| * 0.5 (factor pre-baked)
+        self.edge_weight: np.ndarray = np.zeros(0, dtype=np.float64)
+        # +1 excitatory, -1 inhibitory
+        self.edge_sign: np.ndarray = np.zeros(0, dtype=np.int8)
+        # Edge.weight as written in the file (what traces record)
+        self.edge_raw_weight: np.ndarray = np.zeros(0, dtype=np.float64)
+        # per-rule priority bonus, aligned with ``responses``
+        self.rule_bonus: np.ndarray = np.zeros(0, dtype=np.float64)
+        # every rule's trigger_idx concatenated, and the rule each entry
+        # belongs to; scores come from one bincount over these
+        self.trigger_flat: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.rule_row: np.ndarray = np.zeros(0, dtype=np.intp)
+        self.finalized: bool = False
 
     # ── public query helpers ─────────────────────────────────────────────
 
@@ -71,50 +113,131 @@ class BrainGraph:
     def add_node(self, node: Node) -> None:
         """Insert a node and initialise its adjacency bucket."""
         self.nodes[node.id] = node
+        self._labels[node.id] = node.label
         self.adjacency.setdefault(node.id, [])
+        self.finalized = False
 
     def add_edge(self, edge: Edge) -> None:
         """Insert an edge and update the adjacency index."""
         self.edges.append(edge)
         self.adjacency.setdefault(edge.source, []).append(edge)
+        self.finalized = False
 
     def add_response(self, rule: ResponseRule) -> None:
         """Register a response rule."""
         self.responses.append(rule)
+        self.finalized = False
+
+    def finalize(self) -> None:
+        """Build the Structure-of-Arrays view used by the engine.
+
+        Edges whose endpoints are not known nodes are left out, so they are
+        never traversed.  Current and base activations are clamped to
+        [0, 1], the range the spreading kernels keep every node in.  Must be
+        called again after the graph is modified.
+        """
+        self.node_ids = tuple(self.nodes)
+        self.node_index = {nid: i for i, nid in enumerate(self.node_ids)}
+        self.activation = np.fromiter(
+            (n.activation for n in self.nodes.values()),
+            dtype=np.float64,
+            count=len(self.nodes),
+        )
+        self.base_activation = np.fromiter(
+            (n.base_activation for n in self.nodes.values()),
+            dtype=np.float64,
+            count=len(self.nodes),
+        )
+        np.clip(self.activation, 0.0, 1.0, out=self.activation)
+        np.clip(self.base_activation, 0.0, 1.0, out=self.base_activation)
+
+        src_idx: List[int] = []
+        tgt_idx: List[int] = []
+        weights: List[float] = []
+        signs: List[int] = []
+        self.edge_order = []
+        for i, nid in enumerate(self.node_ids):
+            for edge in self.adjacency.get(nid, []):
+                j = self.node_index.get(edge.target)
+                if j is None:
+                    continue
+                self.edge_order.append(edge)
+                src_idx.append(i)
+                tgt_idx.append(j)
+                if edge.edge_type == "excitatory":
+                    weights.append(edge.weight)
+                    signs.append(1)
+                else:
+                    weights.append(abs(edge.weight) * 0.5)
+                    signs.append(-1)
+
+        self.edge_src = np.asarray(src_idx, dtype=np.int32)
+        self.edge_tgt = np.asarray(tgt_idx, dtype=np.int32)
+        self.edge_weight = np.asarray(weights, dtype=np.float64)
+        self.edge_sign = np.asarray(signs, dtype=np.int8)
+        self.edge_raw_weight = np.asarray([e.weight for e in self.edge_order], dtype=np.float64)
+
+        # Unknown trigger concepts never score, so they are dropped here
+        for rule in self.responses:
+            rule.trigger_idx = np.asarray(
+                [self.node_index[c] for c in rule.trigger_concepts if c in self.node_index],
+                dtype=np.int32,
+            )
+        self.rule_bonus = np.asarray(
+            [rule.priority * 0.01 for rule in self.responses], dtype=np.float64,
+        )
+        self.trigger_flat = np.concatenate(
+            [np.zeros(0, dtype=np.int32)] + [rule.trigger_idx for rule in self.responses]
+        )
+        self.rule_row = np.repeat(
+            np.arange(len(self.responses), dtype=np.intp),
+            [rule.trigger_idx.size for rule in self.responses],
+        )
+        self.finalized = True
+
+    def sync_nodes(self) -> None:
+        """Copy the activation vector back onto the Node objects."""
+        for node, act in zip(self.nodes.values(), self.activation.tolist()):
+            node.activation = act
 
     def reset_activations(self) -> None:
-        """Set every node's current activation back to its base value."""
-        for node in self.nodes.values():
-            node.activation = node.base_activation
+        """Set every node's current activation back to its base value.
+
+        Only the activation vector is reset; call :meth:`sync_nodes` to
+        refresh the Node objects.
+        """
+        np.copyto(self.activation, self.base_activation)
 
 
 # ── Parser ───────────────────────────────────────────────────────────────────
 
 class BrainParser:
-    """Reads a .brain file and produces a BrainGraph."""
+    """Reads a .brain file and produces a BrainGraph.
+
+    Node, edge-endpoint, rule and trigger ids are interned with
+    :func:`sys.intern` so the engine's per-turn dict lookups compare them by
+    identity.  Only these short ASCII ids are interned; labels and other
+    free text are not.
+    """
 
     def parse(self, filepath: str) -> BrainGraph:
         """Parse *filepath* and return a populated BrainGraph."""
         graph = BrainGraph()
         current_section: str = ""
 
-        with open(filepath, "r", encoding="utf-8") as fh:
-            for raw_line in fh:
-                line = raw_line.strip()
-                if not line or line.startswith("#"):
-                    continue
+        for line in iter_lines(filepath):
+            if line.startswith("@section"):
+                current_section = line.split(maxsplit=1)[1].strip().lower()
+                continue
 
-                if line.startswith("@section"):
-                    current_section = line.split(maxsplit=1)[1].strip().lower()
-                    continue
-
-                if current_section == "nodes":
-                    self._parse_node(line, graph)
-                elif current_section == "edges":
-                    self._parse_edge(line, graph)
-                elif current_section == "responses":
-                    self._parse_response(line, graph)
+            if current_section == "nodes":
+                self._parse_node(line, graph)
+            elif current_section == "edges":
+                self._parse_edge(line, graph)
+            elif current_section == "responses":
+                self._parse_response(line, graph)
 
+        graph.finalize()
         return graph
 
     # ── private helpers ──────────────────────────────────────────────────
@@ -125,24 +248,15 @@ class BrainParser:
 
         Format: node_id | type:T | label:L | base_activation:F
         """
-        parts = [p.strip() for p in line.split("|")]
-        if not parts:
-            return
-        node_id = parts[0]
-        ntype = "concept"
-        label = node_id
-        base_act = 0.0
-
-        for part in parts[1:]:
-            if part.startswith("type:"):
-                ntype = part[len("type:"):].strip()
-            elif part.startswith("label:"):
-                label = part[len("label:"):].strip()
-            elif part.startswith("base_activation:"):
-                try:
-                    base_act = float(part[len("base_activation:"):].strip())
-                except ValueError:
-                    base_act = 0.0
+        head, _, tail = line.partition("|")
+        node_id = sys.intern(head.strip())
+        fields = split_fields(tail)
+        ntype = fields.get("type", "concept")
+        label = fields.get("label", node_id)
+        try:
+            base_act = float(fields.get("base_activation", 0.0))
+        except ValueError:
+            base_act = 0.0
 
         graph.add_node(Node(
             id=node_id,
@@ -159,25 +273,17 @@ class BrainParser:
         Format: source_id -> target_id | weight:F | type:T
         """
         # Split on first '|' to isolate the arrow part
-        segments = [s.strip() for s in line.split("|")]
-        if not segments:
-            return
-
-        arrow_part = segments[0]
+        arrow_part, _, tail = line.partition("|")
         if "->" not in arrow_part:
             return
-        src, tgt = [s.strip() for s in arrow_part.split("->", maxsplit=1)]
-
-        weight = 0.5
-        etype = "excitatory"
-        for seg in segments[1:]:
-            if seg.startswith("weight:"):
-                try:
-                    weight = float(seg[len("weight:"):].strip())
-                except ValueError:
-                    weight = 0.5
-            elif seg.startswith("type:"):
-                etype = seg[len("type:"):].strip()
+        src, tgt = [sys.intern(s.strip()) for s in arrow_part.split("->", maxsplit=1)]
+
+        fields = split_fields(tail)
+        etype = fields.get("type", "excitatory")
+        try:
+            weight = float(fields.get("weight", 0.5))
+        except ValueError:
+            weight = 0.5
 
         graph.add_edge(Edge(source=src, target=tgt, weight=weight, edge_type=etype))
 
@@ -187,23 +293,14 @@ class BrainParser:
 
         Format: response_id | trigger_concepts:c1,c2 | intent:I | priority:N
         """
-        parts = [p.strip() for p in line.split("|")]
-        if not parts:
-            return
-        rid = parts[0]
-        triggers: List[str] = []
-        intent = ""
-        priority = 0
-
-        for part in parts[1:]:
-            if part.startswith("trigger_concepts:"):
-                triggers = [t.strip() for t in part[len("trigger_concepts:"):].split(",") if t.strip()]
-            elif part.startswith("intent:"):
-                intent = part[len("intent:"):].strip()
-            elif part.startswith("priority:"):
-                try:
-                    priority = int(part[len("priority:"):].strip())
-                except ValueError:
-                    priority = 0
+        head, _, tail = line.partition("|")
+        rid = sys.intern(head.strip())
+        fields = split_fields(tail)
+        triggers = [sys.intern(t.strip()) for t in fields.get("trigger_concepts", "").split(",") if t.strip()]
+        intent = fields.get("intent", "")
+        try:
+            priority = int(fields.get("priority", 0))
+        except ValueError:
+            priority = 0
 
         graph.add_response(ResponseRule(id=rid, trigger_concepts=triggers, intent=intent, priority=priority))
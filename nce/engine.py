@@ -2,18 +2,149 @@
 
 from __future__ import annotations
 
+import functools
 import re
 from typing import Dict, List, Set, Tuple
 
+import numpy as np
+
+try:
+    from nce._spread import spread as _spread_cython
+except ImportError:  # optional C extension, see setup.py
+    _spread_cython = None
+
+# Numba is only needed (and only imported) when the Cython kernel is missing
+numba = None
+if _spread_cython is None:
+    try:
+        import numba
+    except ImportError:  # optional accelerator
+        pass
+
 from nce.brain import BrainGraph, ResponseRule
 from nce.memory import EpisodicMemory, ShortTermMemory
 from nce.nol import NolData
 from nce.realize import Realizer
+from nce import utils
 from nce.utils import Profiler, ThoughtTrace
 
 
 # Simple regex: split on whitespace and common punctuation
 _TOKEN_RE = re.compile(r"[a-z0-9']+")
+_TOKEN_FINDALL = _TOKEN_RE.findall
+
+
+# ── Spreading kernels ────────────────────────────────────────────────────────
+#
+# The kernel is picked once at import: the Cython extension (nce/_spread.pyx)
+# if it was built, else the Numba-compiled loop, else the NumPy version.
+# All kernels share one signature and return
+#   (act, traversed, node_step, node_idx, node_act, edge_step, edge_idx)
+# where ``traversed`` counts edges leaving an active node and the five
+# arrays describe, per step, the nodes that were active and the edges that
+# were traversed.  The arrays are only filled when ``record`` is true; the
+# caller turns them into trace entries, so no Python callbacks run inside
+# the kernel.
+#
+# Edge weights arrive split in two, with sign and modulator already folded
+# in: ``w_exc`` is zero on inhibitory edges and ``w_inh`` is zero on
+# excitatory ones, so a * w_exc * df + a * w_inh applies decay to the
+# excitatory term only, without a per-edge branch.
+#
+# ``updates`` is a caller-owned scratch vector of the same length as ``act``;
+# it is cleared at the start of every step.
+
+def _spread_loop(act, src, tgt, w_exc, w_inh, steps, decay, threshold, updates, record):
+    """Scalar spreading loop; compiled with Numba when it is installed."""
+    n = act.shape[0]
+    m = src.shape[0]
+    act = act.copy()
+    node_cap = steps * n if record else 0
+    edge_cap = steps * m if record else 0
+    node_step = np.empty(node_cap, dtype=np.int32)
+    node_idx = np.empty(node_cap, dtype=np.int32)
+    node_act = np.empty(node_cap, dtype=np.float64)
+    edge_step = np.empty(edge_cap, dtype=np.int32)
+    edge_idx = np.empty(edge_cap, dtype=np.int32)
+    nn = 0
+    ne = 0
+    traversed = 0
+    df = 1.0
+
+    for s in range(steps):
+        updates[:] = 0.0
+
+        if record:
+            for i in range(n):
+                if act[i] > threshold:
+                    node_step[nn] = s
+                    node_idx[nn] = i
+                    node_act[nn] = act[i]
+                    nn += 1
+
+        for e in range(m):
+            a = act[src[e]]
+            if a > threshold:
+                updates[tgt[e]] += a * w_exc[e] * df + a * w_inh[e]
+                traversed += 1
+                if record:
+                    edge_step[ne] = s
+                    edge_idx[ne] = e
+                    ne += 1
+
+        for i in range(n):
+            v = act[i] + updates[i]
+            act[i] = 0.0 if v < 0.0 else (1.0 if v > 1.0 else v)
+
+        df *= decay
+
+    return act, traversed, node_step[:nn], node_idx[:nn], node_act[:nn], edge_step[:ne], edge_idx[:ne]
+
+
+def _spread_numpy(act, src, tgt, w_exc, w_inh, steps, decay, threshold, updates, record):
+    """Vectorised spreading: one scatter-add sparse mat-vec per step."""
+    act = act.copy()
+    node_parts: List[Tuple[np.ndarray, np.ndarray]] = []
+    edge_parts: List[np.ndarray] = []
+    traversed = 0
+    df = 1.0
+
+    for s in range(steps):
+        src_act = act[src]
+        edge_active = src_act > threshold
+        traversed += int(np.count_nonzero(edge_active))
+        if record:
+            active = np.flatnonzero(act > threshold)
+            node_parts.append((active, act[active]))
+            edge_parts.append(np.flatnonzero(edge_active))
+
+        contrib = np.where(edge_active, src_act * w_exc * df + src_act * w_inh, 0.0)
+        updates.fill(0.0)
+        np.add.at(updates, tgt, contrib)
+        act += updates
+        np.clip(act, 0.0, 1.0, out=act)
+        df *= decay
+
+    if not record:
+        none_i = np.empty(0, dtype=np.int32)
+        return act, traversed, none_i, none_i, np.empty(0, dtype=np.float64), none_i, none_i
+
+    node_step = np.concatenate([np.full(idx.size, s, dtype=np.int32)
+                                for s, (idx, _) in enumerate(node_parts)])
+    node_idx = np.concatenate([idx for idx, _ in node_parts]).astype(np.int32)
+    node_act = np.concatenate([vals for _, vals in node_parts])
+    edge_step = np.concatenate([np.full(idx.size, s, dtype=np.int32)
+                                for s, idx in enumerate(edge_parts)])
+    edge_idx = np.concatenate(edge_parts).astype(np.int32)
+    return act, traversed, node_step, node_idx, node_act, edge_step, edge_idx
+
+
+if _spread_cython is not None:
+    _spread_kernel = _spread_cython
+elif numba is not None:
+    _spread_kernel = numba.njit(cache=True)(_spread_loop)
+else:
+    _spread_kernel = _spread_numpy
 
 
 class NCEEngine:
@@ -23,6 +154,10 @@ class NCEEngine:
 
     # Activation threshold — nodes below this are considered inactive
     ACTIVATION_THRESHOLD: float = 0.05
+    # Number of top active concepts handed to the realizer
+    PLAN_TOP_K: int = 8
+    # Distinct token sequences remembered by map_to_concepts
+    CONCEPT_CACHE_SIZE: int = 2048
 
     def __init__(
         self,
@@ -47,20 +182,52 @@ class NCEEngine:
 
         self._turn: int = 0
 
+        # Profiler stage ids, registered once up front
+        register = profiler.register_stage
+        self._st_tokenize: int = register("tokenize")
+        self._st_activate: int = register("activate")
+        self._st_spread: int = register("spread")
+        self._st_plan: int = register("plan")
+        self._st_realize: int = register("realize")
+
+        if not self.graph.finalized:
+            self.graph.finalize()
+
+        # Token tuple -> concept ids, cached per engine (see map_to_concepts)
+        self._concepts_for = functools.lru_cache(maxsize=self.CONCEPT_CACHE_SIZE)(
+            self._lookup_concepts
+        )
+
+        # Per-step scatter buffer for spread_activation.  Owned by this
+        # engine, so each conversation (engine) can run on its own thread.
+        self._updates: np.ndarray = np.zeros(len(self.graph.node_ids), dtype=np.float64)
+
     # ──────────────────────────────────────────────────────────────────────
     # Pipeline stages
     # ──────────────────────────────────────────────────────────────────────
 
     def tokenize(self, input_text: str) -> List[str]:
         """Stage 1 — whitespace + punctuation split, lowercased."""
-        self.profiler.start_stage("tokenize")
-        tokens = _TOKEN_RE.findall(input_text.lower())
-        self.profiler.end_stage("tokenize")
+        with self.profiler.stage(self._st_tokenize):
+            tokens = _TOKEN_FINDALL(input_text.lower())
         return tokens
 
     def map_to_concepts(self, tokens: List[str]) -> List[str]:
-        """Stage 2 — look up tokens (and synonyms) in the NolData vocab."""
-        self.profiler.start_stage("activate")
+        """Stage 2 — look up tokens (and synonyms) in the NolData vocab.
+
+        Results are cached per token sequence; call
+        :meth:`clear_concept_cache` after modifying ``self.nol.vocab``.
+        """
+        with self.profiler.stage(self._st_activate):
+            concept_ids = list(self._concepts_for(tuple(tokens)))
+        return concept_ids
+
+    def clear_concept_cache(self) -> None:
+        """Forget cached map_to_concepts results (e.g. after a vocab reload)."""
+        self._concepts_for.cache_clear()
+
+    def _lookup_concepts(self, tokens: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Uncached body of map_to_concepts: unique concept ids in token order."""
         concept_ids: List[str] = []
         seen: Set[str] = set()
         for token in tokens:
@@ -68,23 +235,26 @@ class NCEEngine:
             if entry and entry.concept_id not in seen:
                 concept_ids.append(entry.concept_id)
                 seen.add(entry.concept_id)
-        self.profiler.end_stage("activate")
-        return concept_ids
+        return tuple(concept_ids)
 
     def inject_activation(self, concept_ids: List[str]) -> None:
         """Stage 3 — seed matched concepts with activation 1.0 and apply STM priming."""
+        act = self.graph.activation
+        index = self.graph.node_index
+        seeded = 0
         for cid in concept_ids:
-            node = self.graph.get_node(cid)
-            if node:
-                node.activation = 1.0
-                self.profiler.activated_nodes += 1
+            i = index.get(cid)
+            if i is not None:
+                act[i] = 1.0
+                seeded += 1
+        self.profiler.activated_nodes += seeded
 
         # Priming boost from short-term memory
         primed = self.stm.get_primed_concepts()
         for pid in primed:
-            node = self.graph.get_node(pid)
-            if node and node.activation < 1.0:
-                node.activation = min(1.0, node.activation + 0.3)
+            i = index.get(pid)
+            if i is not None and act[i] < 1.0:
+                act[i] = min(1.0, act[i] + 0.3)
 
     def spread_activation(
         self,
@@ -92,102 +262,106 @@ class NCEEngine:
         steps: int = 3,
         decay: float = 0.8,
     ) -> None:
-        """Stage 4 — iterative spreading activation across the graph."""
-        self.profiler.start_stage("spread")
-
-        # Compute a combined modulator multiplier
-        mod_factor: float = 1.0
-        for val in self.modulators.values():
-            mod_factor *= val
-
-        for step in range(steps):
-            # Pre-compute decay factor once per step to avoid redundant exponentiation
-            decay_factor: float = decay ** step
-
-            # Snapshot current activations so updates don't feed forward within a step
-            updates: Dict[str, float] = {}
+        """Stage 4 — iterative spreading activation across the graph.
 
-            for node in self.graph.nodes.values():
-                if node.activation <= self.ACTIVATION_THRESHOLD:
-                    continue
-
-                # Record active node in trace
-                trace.record_node(step, node.id, node.activation)
-
-                for edge in self.graph.get_edges_from(node.id):
-                    target = self.graph.get_node(edge.target)
-                    if target is None:
-                        continue
-
-                    self.profiler.traversed_edges += 1
-                    trace.record_edge(step, edge.source, edge.target, edge.weight)
-
-                    delta: float
-                    if edge.edge_type == "excitatory":
-                        delta = node.activation * edge.weight * decay_factor
-                    else:  # inhibitory
-                        delta = -(node.activation * abs(edge.weight) * 0.5)
-
-                    # Apply modulator scaling
-                    delta *= mod_factor
-                    updates[edge.target] = updates.get(edge.target, 0.0) + delta
-
-            # Apply accumulated deltas
-            for nid, delta in updates.items():
-                target = self.graph.get_node(nid)
-                if target:
-                    target.activation = max(0.0, min(1.0, target.activation + delta))
+        Runs over the graph's SoA edge arrays with the first available
+        kernel: the Cython extension (``nce._spread``), then the
+        Numba-compiled loop, then the vectorised NumPy kernel.  Inhibitory
+        edges are not decayed.
+        """
+        with self.profiler.stage(self._st_spread):
+            # Compute a combined modulator multiplier
+            mod_factor: float = 1.0
+            for val in self.modulators.values():
+                mod_factor *= val
+
+            # Fold sign and modulator into the weights once per turn
+            graph = self.graph
+            excitatory = graph.edge_sign > 0
+            eff_w = graph.edge_weight * graph.edge_sign * mod_factor
+            w_exc = np.where(excitatory, eff_w, 0.0)
+            w_inh = np.where(excitatory, 0.0, eff_w)
+
+            if self._updates.shape[0] != graph.activation.shape[0]:
+                self._updates = np.zeros_like(graph.activation)
+
+            # read the switch at call time so runtime toggles apply here too
+            record = self.profiler.trace_enabled and utils.TRACING_ENABLED
+            sink = trace if record else ThoughtTrace.NULL
+            (graph.activation, traversed, node_step, node_idx, node_act,
+             edge_step, edge_idx) = _spread_kernel(
+                graph.activation, graph.edge_src, graph.edge_tgt,
+                w_exc, w_inh, steps, decay, self.ACTIVATION_THRESHOLD,
+                self._updates, record,
+            )
 
-            self.profiler.steps_executed += 1
+            # Hand the kernel's index arrays straight to the trace; node
+            # names are resolved from graph.node_ids only when it is read.
+            # When not recording the arrays are empty and the sink is NULL.
+            if record:
+                trace.id_to_name = graph.node_ids
+            sink.record_node_ids(node_step, node_idx, node_act)
+            sink.record_edge_ids(edge_step, graph.edge_src[edge_idx],
+                                 graph.edge_tgt[edge_idx], graph.edge_raw_weight[edge_idx])
 
-        self.profiler.end_stage("spread")
+            self.profiler.traversed_edges += traversed
+            self.profiler.steps_executed += steps
 
     def select_response(self, trace: ThoughtTrace) -> ResponseRule:
-        """Stage 5 — score response rules and pick the best one."""
-        self.profiler.start_stage("plan")
-
-        best_rule: ResponseRule | None = None
-        best_score: float = -1.0
+        """Stage 5 — score response rules and pick the best one.
 
-        for rule in self.graph.responses:
-            score = sum(
-                (self.graph.get_node(c).activation if self.graph.get_node(c) else 0.0)
-                for c in rule.trigger_concepts
-            )
-            # Weight by priority
-            score += rule.priority * 0.01
-            if score > best_score:
-                best_score = score
-                best_rule = rule
-
-        # Fallback rule when nothing fires
-        if best_rule is None or best_score < self.ACTIVATION_THRESHOLD:
-            best_rule = ResponseRule(id="r_fallback", trigger_concepts=[], intent="unknown", priority=0)
-
-        trace.response_intent = best_rule.intent
-        self.profiler.end_stage("plan")
+        Every rule is scored at once: ``np.bincount`` sums the activations
+        of each rule's triggers (in trigger order, like a running sum) and
+        the priority bonus is added on top.  Ties go to the earlier rule.
+        """
+        with self.profiler.stage(self._st_plan):
+            graph = self.graph
+            rules = graph.responses
+            best_idx: int = -1
+            best_score: float = -1.0
+
+            # Weight by priority (not in place: with no triggers at all
+            # bincount returns int64)
+            scores = np.bincount(
+                graph.rule_row,
+                weights=graph.activation[graph.trigger_flat],
+                minlength=len(rules),
+            ) + graph.rule_bonus
+            if scores.size:
+                j = int(scores.argmax())
+                if scores[j] > best_score:
+                    best_idx = j
+                    best_score = float(scores[j])
+
+            best_rule: ResponseRule | None = rules[best_idx] if best_idx >= 0 else None
+
+            # Fallback rule when nothing fires
+            if best_rule is None or best_score < self.ACTIVATION_THRESHOLD:
+                best_rule = ResponseRule(id="r_fallback", trigger_concepts=[], intent="unknown", priority=0)
+
+            trace.response_intent = best_rule.intent
         return best_rule
 
     def plan_response(self, rule: ResponseRule) -> Tuple[str, str]:
         """Stage 6 — map a ResponseRule to (intent, template_text)."""
-        self.profiler.start_stage("realize")
-
-        # Gather active concepts sorted by activation (descending)
-        active: List[Tuple[float, str]] = [
-            (n.activation, n.id)
-            for n in self.graph.nodes.values()
-            if n.activation > self.ACTIVATION_THRESHOLD
-        ]
-        active.sort(reverse=True)
-        active_ids = [cid for _, cid in active]
-
-        # Build label map
-        labels: Dict[str, str] = {
-            n.id: n.label for n in self.graph.nodes.values()
-        }
-
-        text = self.realizer.realize(rule.intent, active_ids, self.nol, labels)
-        self.profiler.end_stage("realize")
+        with self.profiler.stage(self._st_realize):
+            # Gather the top-k active concepts sorted by activation (descending)
+            act = self.graph.activation
+            ids = self.graph.node_ids
+            idxs = np.flatnonzero(act > self.ACTIVATION_THRESHOLD)
+            vals = act[idxs]
+            k = min(self.PLAN_TOP_K, idxs.size)
+            if idxs.size > k:
+                # keep everything tied with the k-th largest so ties break by id
+                keep = vals >= np.partition(vals, -k)[-k]
+                idxs = idxs[keep]
+                vals = vals[keep]
+            active: List[Tuple[float, str]] = sorted(
+                zip(vals.tolist(), [ids[i] for i in idxs.tolist()]), reverse=True,
+            )[:k]
+            active_ids = [cid for _, cid in active]
+
+            text = self.realizer.realize(rule.intent, active_ids, self.nol, self.graph.labels)
         return rule.intent, text
 
     # ──────────────────────────────────────────────────────────────────────
@@ -201,6 +375,9 @@ class NCEEngine:
           response_text, thought_trace, profiling_data
         """
         self.profiler.reset()
+        # rebuild the SoA view if the graph was edited since the last turn
+        if not self.graph.finalized:
+            self.graph.finalize()
         self.graph.reset_activations()
         trace = ThoughtTrace()
         self._turn += 1
@@ -224,9 +401,10 @@ class NCEEngine:
         intent, response_text = self.plan_response(rule)
 
         # Record final concepts (those still above threshold)
+        ids = self.graph.node_ids
         final_concepts = [
-            n.id for n in self.graph.nodes.values()
-            if n.activation > self.ACTIVATION_THRESHOLD
+            ids[i]
+            for i in np.flatnonzero(self.graph.activation > self.ACTIVATION_THRESHOLD)
         ]
         trace.final_concepts = sorted(final_concepts)
 
@@ -241,6 +419,9 @@ class NCEEngine:
             reinforcement=0.0,
         )
 
+        # Publish the activation vector back onto the Node objects
+        self.graph.sync_nodes()
+
         return {
             "response_text": response_text,
             "thought_trace": trace,
@@ -2,8 +2,10 @@
 """Neuron Conversation Engine — REPL entry point.
 
 Usage:
-    python -m nce.main [--nol PATH] [--brain PATH]
-    python nce/main.py [--nol PATH] [--brain PATH]
+    python -m nce.main [--nol PATH] [--brain PATH] [--trace]
+    python nce/main.py [--nol PATH] [--brain PATH] [--trace]
+
+Set ``NCE_PROFILE=0`` to disable per-stage timing.
 """
 
 from __future__ import annotations
@@ -22,7 +24,7 @@ from nce.brain import BrainParser
 from nce.engine import NCEEngine
 from nce.memory import EpisodicMemory, ShortTermMemory
 from nce.nol import NolParser
-from nce.utils import Profiler, ThoughtTrace
+from nce.utils import NullProfiler, Profiler, ThoughtTrace
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
@@ -58,6 +60,8 @@ def main() -> None:
                         help="Path to .nol vocabulary/template file")
     parser.add_argument("--brain", default=os.path.join(_PROJECT_ROOT, "example.brain"),
                         help="Path to .brain graph file")
+    parser.add_argument("--trace", action="store_true",
+                        help="Record and print the thought trace for each turn")
     args = parser.parse_args()
 
     # Load data files
@@ -80,7 +84,8 @@ def main() -> None:
     # Bootstrap engine components
     stm = ShortTermMemory(capacity=5)
     episodic = EpisodicMemory(max_episodes=100)
-    profiler = Profiler()
+    profiler_cls = NullProfiler if os.environ.get("NCE_PROFILE") == "0" else Profiler
+    profiler = profiler_cls(trace_enabled=args.trace)
     engine = NCEEngine(brain_graph, nol_data, stm, episodic, profiler)
 
     print(_BANNER)
@@ -105,8 +110,9 @@ def main() -> None:
         print(f"\nNCE> {result['response_text']}\n")
 
         # Display thought trace
-        trace: ThoughtTrace = result["thought_trace"]
-        print(trace.pretty_print())
+        if args.trace:
+            trace: ThoughtTrace = result["thought_trace"]
+            print(trace.pretty_print())
 
         # Display profiling stats
         print(_format_profiling(result["profiling_data"]))
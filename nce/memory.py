@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from collections import deque
+from collections import Counter, deque
 from dataclasses import dataclass, field
-from typing import Deque, List, Set, Tuple
+from typing import AbstractSet, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
 
 
 # ── Short-Term Memory ────────────────────────────────────────────────────────
@@ -27,7 +29,10 @@ class ShortTermMemory:
 
     def __init__(self, capacity: int = 5) -> None:
         self._capacity: int = capacity
-        self._buffer: Deque[STMEntry] = deque(maxlen=capacity)
+        # evicted manually so the concept counts can be kept in step
+        self._buffer: Deque[STMEntry] = deque()
+        # concept_id -> number of buffered entries that contain it
+        self._counts: Counter[str] = Counter()
 
     def add_turn(
         self,
@@ -37,24 +42,37 @@ class ShortTermMemory:
         response_text: str,
     ) -> None:
         """Record a completed turn."""
+        if self._capacity <= 0:
+            return
+        if len(self._buffer) >= self._capacity:
+            evicted = self._buffer.popleft()
+            for c in evicted.active_concepts:
+                self._counts[c] -= 1
+                if not self._counts[c]:
+                    del self._counts[c]
+
+        # de-duplicate so each entry counts a concept at most once
+        concepts = list(dict.fromkeys(active_concepts))
         self._buffer.append(STMEntry(
             turn_number=turn_number,
             input_text=input_text,
-            active_concepts=list(active_concepts),
+            active_concepts=concepts,
             response_text=response_text,
         ))
+        self._counts.update(concepts)
 
     def get_recent(self, n: int = 5) -> List[STMEntry]:
         """Return the *n* most recent entries (oldest first)."""
         items = list(self._buffer)
         return items[-n:]
 
-    def get_primed_concepts(self) -> Set[str]:
-        """Return the union of active concepts across recent turns."""
-        primed: Set[str] = set()
-        for entry in self._buffer:
-            primed.update(entry.active_concepts)
-        return primed
+    def get_primed_concepts(self) -> AbstractSet[str]:
+        """Return the union of active concepts across recent turns.
+
+        The result is a live, read-only view; copy it with ``set()`` if it
+        must outlive the next :meth:`add_turn`.
+        """
+        return self._counts.keys()
 
 
 # ── Episodic Memory ──────────────────────────────────────────────────────────
@@ -68,15 +86,38 @@ class Episode:
     reinforcement: float = 0.0
 
 
+# Per-byte popcount table, used when np.bitwise_count (NumPy >= 2.0) is missing
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(masks: np.ndarray) -> np.ndarray:
+    """Return the number of set bits in each row of a 2-D uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).sum(axis=1, dtype=np.int64)
+    as_bytes = masks.view(np.uint8).reshape(masks.shape[0], -1)
+    return _POPCOUNT8[as_bytes].sum(axis=1, dtype=np.int64)
+
+
 class EpisodicMemory:
     """Long-ish-term store of concept episodes with Jaccard-based recall.
 
-    Oldest episodes are evicted once *max_episodes* is reached.
+    Oldest episodes are evicted once *max_episodes* is reached.  Episodes
+    live in a ring buffer; each slot's context concepts are also packed
+    into a row of a uint64 bitmask matrix so recall scores every episode
+    with a few vectorised AND / OR / popcount operations.
     """
 
     def __init__(self, max_episodes: int = 100) -> None:
         self._max: int = max_episodes
-        self._episodes: List[Episode] = []
+        # fixed-size ring buffer; the first _filled slots hold episodes
+        self._episodes: List[Optional[Episode]] = [None] * max(max_episodes, 0)
+        # next slot to write (the oldest slot once the ring is full)
+        self._head: int = 0
+        self._filled: int = 0
+        # concept_id -> bit position in the mask rows
+        self._bits: Dict[str, int] = {}
+        # one row of packed context-concept bits per episode slot
+        self._masks: np.ndarray = np.zeros((max(max_episodes, 0), 1), dtype=np.uint64)
 
     def store_episode(
         self,
@@ -86,14 +127,27 @@ class EpisodicMemory:
         reinforcement: float = 0.0,
     ) -> None:
         """Persist a new episode, evicting the oldest if at capacity."""
-        if len(self._episodes) >= self._max:
-            self._episodes.pop(0)
-        self._episodes.append(Episode(
+        if self._max <= 0:
+            return
+        episode = Episode(
             turn=turn,
             context_concepts=set(context_concepts),
             outcome_concepts=set(outcome_concepts),
             reinforcement=reinforcement,
-        ))
+        )
+        slot = self._head
+        self._episodes[slot] = episode
+        self._head = (slot + 1) % self._max
+        self._filled = min(self._filled + 1, self._max)
+
+        row = self._masks[slot]
+        row[:] = 0
+        for c in episode.context_concepts:
+            bit = self._bits.get(c)
+            if bit is None:
+                bit = self._register(c)
+                row = self._masks[slot]
+            row[bit >> 6] |= np.uint64(1) << np.uint64(bit & 63)
 
     def recall_similar(
         self,
@@ -103,17 +157,45 @@ class EpisodicMemory:
         """Return the *top_k* episodes most similar to *current_concepts*.
 
         Similarity is measured with Jaccard index over context_concepts.
+        Ties keep the oldest episode first.
         """
-        if not current_concepts or not self._episodes:
+        if not current_concepts or not self._filled:
             return []
 
-        scored: List[Tuple[float, Episode]] = []
-        for ep in self._episodes:
-            intersection = current_concepts & ep.context_concepts
-            union = current_concepts | ep.context_concepts
-            jaccard = len(intersection) / len(union) if union else 0.0
-            scored.append((jaccard, ep))
-
-        # Sort descending by similarity
-        scored.sort(key=lambda t: t[0], reverse=True)
-        return [ep for _, ep in scored[:top_k]]
+        query, unknown = self._encode(current_concepts)
+        n = self._filled
+        masks = self._masks[:n]
+        inter = _popcount_rows(masks & query)
+        union = _popcount_rows(masks | query) + unknown
+        scores = np.divide(inter, union, out=np.zeros(n), where=union > 0)
+
+        # Visit slots oldest-first so the stable sort breaks ties like before
+        oldest = self._head if n == self._max else 0
+        order = (oldest + np.arange(n)) % n
+        ranked = order[np.argsort(-scores[order], kind="stable")[:top_k]]
+        return [self._episodes[i] for i in ranked]
+
+    # ── private helpers ──────────────────────────────────────────────────
+
+    def _register(self, concept_id: str) -> int:
+        """Assign the next free bit to *concept_id*, widening rows as needed."""
+        bit = len(self._bits)
+        self._bits[concept_id] = bit
+        words = self._masks.shape[1]
+        if bit >> 6 >= words:
+            grown = np.zeros((self._masks.shape[0], words * 2), dtype=np.uint64)
+            grown[:, :words] = self._masks
+            self._masks = grown
+        return bit
+
+    def _encode(self, concepts: Iterable[str]) -> Tuple[np.ndarray, int]:
+        """Pack *concepts* into a mask row; also count never-seen concepts."""
+        query = np.zeros(self._masks.shape[1], dtype=np.uint64)
+        unknown = 0
+        for c in concepts:
+            bit = self._bits.get(c)
+            if bit is None:
+                unknown += 1
+            else:
+                query[bit >> 6] |= np.uint64(1) << np.uint64(bit & 63)
+        return query, unknown
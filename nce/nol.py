@@ -7,8 +7,11 @@ The .nol format is a UTF-8 text file with two sections:
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+from nce.utils import iter_lines, split_fields
 
 
 # ── Data structures ──────────────────────────────────────────────────────────
@@ -29,36 +32,55 @@ class NolData:
     vocab: Dict[str, ConceptEntry] = field(default_factory=dict)
     # intent_name -> list of template strings
     templates: Dict[str, List[str]] = field(default_factory=dict)
+    # intent_name -> (source template, template split on ``{concept}``);
+    # a cache over ``templates``, recompiled when the source object changes
+    templates_compiled: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        # compile templates passed to the constructor
+        for intent in self.templates:
+            if intent not in self.templates_compiled:
+                self.compile_templates(intent)
+
+    def compile_templates(self, intent: str) -> List[Tuple[str, Tuple[str, ...]]]:
+        """(Re)build and return the compiled templates of *intent*."""
+        compiled = [(t, tuple(t.split("{concept}"))) for t in self.templates.get(intent, ())]
+        self.templates_compiled[intent] = compiled
+        return compiled
+
+    def add_template(self, intent: str, template: str) -> None:
+        """Register *template* for *intent* in both raw and compiled form."""
+        self.templates.setdefault(intent, []).append(template)
+        self.templates_compiled.setdefault(intent, []).append(
+            (template, tuple(template.split("{concept}")))
+        )
 
 
 # ── Parser ───────────────────────────────────────────────────────────────────
 
 class NolParser:
-    """Reads a .nol file and produces a NolData instance."""
+    """Reads a .nol file and produces a NolData instance.
+
+    Vocabulary keys and concept ids are interned with :func:`sys.intern`;
+    template text is not.
+    """
 
     def parse(self, filepath: str) -> NolData:
         """Parse *filepath* and return structured NolData."""
         data = NolData()
         current_section: str = ""
 
-        with open(filepath, "r", encoding="utf-8") as fh:
-            for raw_line in fh:
-                line = raw_line.strip()
+        for line in iter_lines(filepath):
+            # Detect section headers
+            if line.startswith("@section"):
+                current_section = line.split(maxsplit=1)[1].strip().lower()
+                continue
 
-                # Skip blanks and comments
-                if not line or line.startswith("#"):
-                    continue
-
-                # Detect section headers
-                if line.startswith("@section"):
-                    current_section = line.split(maxsplit=1)[1].strip().lower()
-                    continue
-
-                # Dispatch to section-specific handler
-                if current_section == "vocabulary":
-                    self._parse_vocab_line(line, data)
-                elif current_section == "templates":
-                    self._parse_template_line(line, data)
+            # Dispatch to section-specific handler
+            if current_section == "vocabulary":
+                self._parse_vocab_line(line, data)
+            elif current_section == "templates":
+                self._parse_template_line(line, data)
 
         return data
 
@@ -70,26 +92,20 @@ class NolParser:
 
         Format: word_or_phrase | concept_id | synonyms:s1,s2 | category:cat | sentiment:val
         """
-        parts = [p.strip() for p in line.split("|")]
-        if len(parts) < 2:
+        head, sep, tail = line.partition("|")
+        if not sep:
             return  # malformed
-
-        surface_word = parts[0].lower()
-        concept_id = parts[1]
-        synonyms: List[str] = []
-        category: str = ""
-        sentiment: float = 0.0
-
-        for part in parts[2:]:
-            if part.startswith("synonyms:"):
-                synonyms = [s.strip() for s in part[len("synonyms:"):].split(",") if s.strip()]
-            elif part.startswith("category:"):
-                category = part[len("category:"):].strip()
-            elif part.startswith("sentiment:"):
-                try:
-                    sentiment = float(part[len("sentiment:"):].strip())
-                except ValueError:
-                    sentiment = 0.0
+        concept, _, tail = tail.partition("|")
+
+        surface_word = sys.intern(head.strip().lower())
+        concept_id = sys.intern(concept.strip())
+        fields = split_fields(tail)
+        synonyms = [s.strip() for s in fields.get("synonyms", "").split(",") if s.strip()]
+        category = fields.get("category", "")
+        try:
+            sentiment = float(fields.get("sentiment", 0.0))
+        except ValueError:
+            sentiment = 0.0
 
         entry = ConceptEntry(
             concept_id=concept_id,
@@ -102,7 +118,7 @@ class NolParser:
         data.vocab[surface_word] = entry
         # Also index every synonym so lookup works both ways
         for syn in synonyms:
-            data.vocab[syn.lower()] = entry
+            data.vocab[sys.intern(syn.lower())] = entry
 
     @staticmethod
     def _parse_template_line(line: str, data: NolData) -> None:
@@ -110,9 +126,9 @@ class NolParser:
 
         Format: intent_name | template_string
         """
-        parts = [p.strip() for p in line.split("|", maxsplit=1)]
-        if len(parts) < 2:
+        head, sep, tail = line.partition("|")
+        if not sep:
             return
-        intent = parts[0]
-        template = parts[1]
-        data.templates.setdefault(intent, []).append(template)
+        intent = head.strip()
+        template = tail.strip()
+        data.add_template(intent, template)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import List, Mapping
 
 from nce.nol import NolData
 
@@ -11,7 +11,10 @@ class Realizer:
     """Converts an intent + active concepts into a natural-language response.
 
     Template placeholders of the form ``{concept}`` are replaced with the
-    label of the most activated matching concept.
+    label of the most activated matching concept.  ``NolData.templates`` is
+    the source of truth; the split form is taken from
+    ``NolData.templates_compiled`` and rebuilt whenever the first template
+    of an intent is no longer the object it was compiled from.
     """
 
     # Fallback when no template matches the intent
@@ -22,7 +25,7 @@ class Realizer:
         intent: str,
         active_concepts: List[str],
         nol: NolData,
-        concept_labels: Dict[str, str] | None = None,
+        concept_labels: Mapping[str, str] | None = None,
     ) -> str:
         """Produce a surface string for *intent*.
 
@@ -47,22 +50,27 @@ class Realizer:
         if not templates:
             return self._FALLBACK
 
-        # Pick the first available template for this intent
-        template = templates[0]
+        # Pick the first available template for this intent, recompiling
+        # if it was replaced or added without add_template()
+        source = templates[0]
+        compiled = nol.templates_compiled.get(intent)
+        if not compiled or compiled[0][0] is not source:
+            compiled = nol.compile_templates(intent)
+        parts = compiled[0][1]
 
-        # If the template contains {concept}, substitute with best label
-        if "{concept}" in template:
-            label = self._best_label(active_concepts, concept_labels)
-            template = template.replace("{concept}", label)
-
-        return template
+        # Without a {concept} placeholder the template is used verbatim
+        if len(parts) == 1:
+            return parts[0]
+        # Otherwise substitute every placeholder with the best label
+        label = self._best_label(active_concepts, concept_labels)
+        return label.join(parts)
 
     # ── private helpers ──────────────────────────────────────────────────
 
     @staticmethod
     def _best_label(
         active_concepts: List[str],
-        concept_labels: Dict[str, str] | None,
+        concept_labels: Mapping[str, str] | None,
     ) -> str:
         """Return a human-readable label for the top active concept."""
         if not active_concepts:
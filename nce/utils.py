@@ -1,95 +1,640 @@
-"""Profiling and tracing utilities for the NCE pipeline."""
+"""Profiling, tracing and parsing utilities for the NCE pipeline."""
 
 from __future__ import annotations
 
+import functools
+import os
 import time
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from operator import itemgetter
+from typing import ClassVar, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+try:
+    from nce._utils_fast import put_edge as _put_edge, put_node as _put_node
+except ImportError:  # optional C extension, see setup.py
+    def _put_node(buf: np.ndarray, n: int, step: int, nid: int, act: float) -> None:
+        """Write node record number *n* into ring buffer *buf*."""
+        buf[n % buf.shape[0]] = (step, nid, act)
+
+    def _put_edge(buf: np.ndarray, n: int, step: int, src: int, dst: int, w: float) -> None:
+        """Write edge record number *n* into ring buffer *buf*."""
+        buf[n % buf.shape[0]] = (step, src, dst, w)
+
+
+def iter_lines(filepath: str) -> Iterator[str]:
+    """Yield the stripped, non-blank, non-comment lines of a UTF-8 file."""
+    with open(filepath, "r", encoding="utf-8") as fh:
+        for raw in fh:
+            line = raw.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def split_fields(text: str) -> Dict[str, str]:
+    """Map the ``|``-separated ``key:value`` segments of *text* to their values.
+
+    Keys lose leading whitespace and values are stripped.  Segments without
+    a ``:`` are ignored; a repeated key keeps its last value.
+    """
+    fields: Dict[str, str] = {}
+    for part in text.split("|"):
+        key, sep, val = part.partition(":")
+        if sep:
+            fields[key.lstrip()] = val.strip()
+    return fields
+
+
+# Process-wide tracing switch, initialised from NCE_TRACE (0 disables): when
+# off, every ThoughtTrace.record_* call returns immediately and the engine
+# skips recording in its spreading kernel.  Read at call time, so it may be
+# toggled at runtime as ``nce.utils.TRACING_ENABLED``.
+TRACING_ENABLED: bool = os.environ.get("NCE_TRACE", "1") != "0"
+
+
+# Upper bound on buffered node / edge records per ThoughtTrace; once it is
+# reached the oldest records are overwritten.
+_TRACE_CAP: int = max(1, int(os.environ.get("NCE_TRACE_CAP", 1 << 16)))
+# Initial trace buffer size; buffers double until they reach _TRACE_CAP
+_TRACE_INIT: int = min(256, _TRACE_CAP)
+
+# Full-width (20 cell) activation bar printed by ThoughtTrace.pretty_print
+_FULL_BAR = "█" * 20
+
+_NODE_DTYPE = np.dtype([("step", "i4"), ("nid", "i4"), ("act", "f8")])
+_EDGE_DTYPE = np.dtype([("step", "i4"), ("src", "i4"), ("dst", "i4"), ("w", "f8")])
+
+
+@functools.lru_cache(maxsize=256)
+def _step_template(n_rows: int) -> str:
+    """Return the %-template printing one trace step header and *n_rows* nodes."""
+    return "  Step %d:" + "\n    %-20s act=%.4f  %s" * n_rows
+
+
+@functools.lru_cache(maxsize=None)
+def _edge_template(n_rows: int) -> str:
+    """Return the %-template printing *n_rows* edge traversal lines."""
+    return "\n".join(("    step %d: %s ──(%s)──▶ %s",) * n_rows)
+
+
+@functools.lru_cache(maxsize=4096)
+def _weight_text(w: float) -> str:
+    """Return ``"%.2f" % round(w, 4)``, the printed form of a traced edge weight."""
+    # rounding to 4 places only changes the text within 5e-5 of a half-cent
+    c = w * 100
+    return "%.2f" % (round(w, 4) if abs(c - round(c)) > 0.49 else w)
+
+
+def _ring_reserve(buf: np.ndarray, n: int) -> np.ndarray:
+    """Return *buf*, doubled (up to the cap) if record number *n* needs it."""
+    size = buf.shape[0]
+    if n >= size and size < _TRACE_CAP:
+        grown = np.empty(min(size * 2, _TRACE_CAP), dtype=buf.dtype)
+        grown[:size] = buf
+        return grown
+    return buf
+
+
+def _ring_extend(buf: np.ndarray, n: int, block: np.ndarray) -> np.ndarray:
+    """Append *block* to a ring buffer holding *n* records; return the buffer."""
+    size, m = buf.shape[0], block.shape[0]
+    if n + m > size and size < _TRACE_CAP:
+        new_size = size
+        while new_size < n + m and new_size < _TRACE_CAP:
+            new_size *= 2
+        grown = np.empty(min(new_size, _TRACE_CAP), dtype=buf.dtype)
+        grown[:n] = buf[:n]
+        buf, size = grown, grown.shape[0]
+    if m > size:
+        # only the newest `size` rows survive
+        n, block = n + m - size, block[m - size:]
+        m = size
+    start = n % size
+    first = min(m, size - start)
+    buf[start:start + first] = block[:first]
+    buf[:m - first] = block[first:]
+    return buf
+
+
+def _ring_rows(buf: np.ndarray, n: int) -> np.ndarray:
+    """Return the live rows of a ring buffer holding *n* records, oldest first."""
+    size = buf.shape[0]
+    if n <= size:
+        return buf[:n]
+    w = n % size
+    return np.concatenate((buf[w:], buf[:w]))
+
+
+class ProfileSnapshot(NamedTuple):
+    """Raw Profiler state at one point in time, as returned by ``snapshot()``."""
+
+    # registered stage names, in stage-id order
+    names: Tuple[str, ...]
+    # cumulative nanoseconds per stage id
+    timings: List[int]
+    activated_nodes: int
+    traversed_edges: int
+    steps_executed: int
+
+    def timings_ms(self) -> Dict[str, float]:
+        """Return stage name -> milliseconds, rounded to 4 places."""
+        return {k: round(v / 1e6, 4) for k, v in zip(self.names, self.timings)}
+
+
+class _StageCtx:
+    """Reusable context manager timing one profiler stage."""
+
+    __slots__ = ("p", "i", "t")
+
+    def __init__(self, profiler: "Profiler", idx: int) -> None:
+        self.p = profiler
+        self.i = idx
+        self.t = 0
+
+    def __enter__(self) -> None:
+        self.t = time.perf_counter_ns()
+
+    def __exit__(self, *exc: object) -> None:
+        self.p._timings[self.i] += time.perf_counter_ns() - self.t
+
+
+class _NullStageCtx:
+    """Context manager that does nothing; shared by NullProfiler stages."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+
+_NULL_STAGE_CTX = _NullStageCtx()
 
 
 class Profiler:
-    """Tracks wall-clock time per pipeline stage and aggregate counts."""
+    """Tracks wall-clock time per pipeline stage and aggregate counts.
+
+    Stage boundaries read ``perf_counter_ns``; the integer nanoseconds
+    are only converted to milliseconds in :meth:`report`.
+
+    Stages are timed either with ``start_stage``/``end_stage`` or with
+    ``with profiler.stage(idx):``, which also records the time on error.
+
+    ``trace_enabled`` controls whether the engine records node activations
+    and edge traversals into the turn's ThoughtTrace.
+    """
 
-    def __init__(self) -> None:
-        # stage_name -> cumulative seconds
-        self._timings: Dict[str, float] = {}
-        # stage_name -> start timestamp (while running)
-        self._starts: Dict[str, float] = {}
+    __slots__ = (
+        "_names", "_ids", "_timings", "_starts", "_ctx_pool",
+        "activated_nodes", "traversed_edges", "steps_executed", "trace_enabled",
+    )
+
+    def __init__(self, trace_enabled: bool = True) -> None:
+        # stage id -> stage name, and the reverse mapping
+        self._names: Tuple[str, ...] = ()
+        self._ids: Dict[str, int] = {}
+        # stage id -> cumulative nanoseconds
+        self._timings: List[int] = []
+        # stage id -> start time (ns) while running, 0 otherwise
+        self._starts: List[int] = []
+        # stage id -> pooled context manager returned by stage()
+        self._ctx_pool: List[_StageCtx] = []
         # aggregate counters
         self.activated_nodes: int = 0
         self.traversed_edges: int = 0
         self.steps_executed: int = 0
+        # record per-step activations / traversals into the ThoughtTrace
+        self.trace_enabled: bool = trace_enabled
+
+    def register_stage(self, name: str) -> int:
+        """Return the integer id for stage *name*, registering it if new."""
+        idx = self._ids.get(name)
+        if idx is None:
+            idx = len(self._names)
+            self._ids[name] = idx
+            self._names += (name,)
+            self._timings.append(0)
+            self._starts.append(0)
+            self._ctx_pool.append(_StageCtx(self, idx))
+        return idx
+
+    def stage(self, idx: int) -> _StageCtx:
+        """Return a context manager timing stage *idx* (reused across calls)."""
+        return self._ctx_pool[idx]
 
-    def start_stage(self, name: str) -> None:
-        """Mark the beginning of a named pipeline stage."""
-        self._starts[name] = time.perf_counter()
+    def start_stage(self, idx: int) -> None:
+        """Mark the beginning of the pipeline stage with id *idx*."""
+        self._starts[idx] = time.perf_counter_ns()
 
-    def end_stage(self, name: str) -> None:
-        """Mark the end of a named pipeline stage and accumulate elapsed time."""
-        if name in self._starts:
-            elapsed = time.perf_counter() - self._starts.pop(name)
-            self._timings[name] = self._timings.get(name, 0.0) + elapsed
+    def end_stage(self, idx: int) -> None:
+        """Mark the end of stage *idx* and accumulate elapsed time.
+
+        Ending a stage that is not running is a no-op.
+        """
+        t0 = self._starts[idx]
+        if t0:
+            self._timings[idx] += time.perf_counter_ns() - t0
+            self._starts[idx] = 0
+
+    def snapshot(self) -> ProfileSnapshot:
+        """Return the raw timings and counts without building a report.
+
+        Timings stay in nanoseconds (see
+        :meth:`ProfileSnapshot.timings_ms`).  Prefer this over
+        :meth:`report` when polling frequently.
+        """
+        return ProfileSnapshot(
+            self._names,
+            self._timings[:],
+            self.activated_nodes,
+            self.traversed_edges,
+            self.steps_executed,
+        )
 
     def report(self) -> Dict[str, object]:
-        """Return a dict summarising timings (ms) and counts."""
+        """Return a dict summarising timings (ms) and counts.
+
+        Every registered stage is listed, with 0.0 if it did not run.
+        """
+        snap = self.snapshot()
         return {
-            "timings_ms": {k: round(v * 1000, 4) for k, v in self._timings.items()},
-            "activated_nodes": self.activated_nodes,
-            "traversed_edges": self.traversed_edges,
-            "steps_executed": self.steps_executed,
+            "timings_ms": snap.timings_ms(),
+            "activated_nodes": snap.activated_nodes,
+            "traversed_edges": snap.traversed_edges,
+            "steps_executed": snap.steps_executed,
         }
 
     def reset(self) -> None:
-        """Clear all accumulated data."""
-        self._timings.clear()
-        self._starts.clear()
+        """Clear all accumulated data (stage registrations are kept)."""
+        n = len(self._names)
+        self._timings = [0] * n
+        self._starts = [0] * n
         self.activated_nodes = 0
         self.traversed_edges = 0
         self.steps_executed = 0
 
 
-@dataclass
+class NullProfiler(Profiler):
+    """A Profiler whose stage timers do nothing.
+
+    Counters are still kept (they are plain attribute stores), but no clock
+    is read, so ``report()`` lists every stage at 0.0 ms.
+    """
+
+    __slots__ = ()
+
+    def start_stage(self, idx: int) -> None:
+        """No-op."""
+
+    def end_stage(self, idx: int) -> None:
+        """No-op."""
+
+    def stage(self, idx: int) -> _NullStageCtx:
+        """Return a shared no-op context manager."""
+        return _NULL_STAGE_CTX
+
+
 class ThoughtTrace:
-    """Records the step-by-step activation history of a single turn."""
+    """Records the step-by-step activation history of a single turn.
+
+    Node activations and edge traversals live in structured NumPy ring
+    buffers that grow up to ``NCE_TRACE_CAP`` records each (default 65536);
+    past that the oldest records are overwritten.  Node ids are interned
+    into a per-trace table and stored as integer indices.  Values are kept
+    unrounded; rounding happens when the trace is printed.
+
+    ``record_node_id`` / ``record_node_ids`` / ``record_edge_ids`` skip
+    the string handling entirely: they store caller-side integer node ids,
+    resolved only when read through the ``id_to_name`` table (the trace's
+    own, or one passed to ``pretty_print``).
+    """
+
+    __slots__ = (
+        "final_concepts", "response_intent", "id_to_name",
+        "_nodes", "_n_nodes", "_edges", "_n_edges", "_id_table", "_id_list",
+        "_cache_key", "_cache_names", "_cache_text",
+    )
+
+    def __init__(
+        self,
+        final_concepts: Optional[List[str]] = None,
+        response_intent: str = "",
+        id_to_name: Sequence[str] = (),
+    ) -> None:
+        # concept ids that were finally selected
+        self.final_concepts: List[str] = [] if final_concepts is None else final_concepts
+        # the intent chosen for the response
+        self.response_intent: str = response_intent
+        # names of caller-side integer node ids (see record_node_ids)
+        self.id_to_name: Sequence[str] = id_to_name
+        # node activation / edge traversal ring buffers and records written so far
+        self._nodes: np.ndarray = np.empty(_TRACE_INIT, dtype=_NODE_DTYPE)
+        self._n_nodes: int = 0
+        self._edges: np.ndarray = np.empty(_TRACE_INIT, dtype=_EDGE_DTYPE)
+        self._n_edges: int = 0
+        # node id -> id-table index, and the reverse list
+        self._id_table: Dict[str, int] = {}
+        self._id_list: List[str] = []
+        # last pretty_print result, its cache key and id_to_name table
+        self._cache_key: Optional[tuple] = None
+        self._cache_names: Sequence[str] = ()
+        self._cache_text: str = ""
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}(final_concepts={self.final_concepts!r}, "
+                f"response_intent={self.response_intent!r})")
+
+    def __eq__(self, other: object) -> bool:
+        """Compare final concepts, intent and all buffered node / edge records."""
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.final_concepts, self.response_intent, self.node_activations, self.edge_traversals)
+            == (other.final_concepts, other.response_intent, other.node_activations, other.edge_traversals)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    # shared do-nothing trace; set below the class definitions
+    NULL: ClassVar["ThoughtTrace"]
+
+    # activation bars for 0..20 cells
+    _BARS = tuple(_FULL_BAR[:i] for i in range(len(_FULL_BAR) + 1))
 
-    # (step, node_id, activation_value)
-    node_activations: List[Tuple[int, str, float]] = field(default_factory=list)
-    # (step, edge_src, edge_dst, weight)
-    edge_traversals: List[Tuple[int, str, str, float]] = field(default_factory=list)
-    # concept ids that were finally selected
-    final_concepts: List[str] = field(default_factory=list)
-    # the intent chosen for the response
-    response_intent: str = ""
+    @property
+    def node_activations(self) -> List[Tuple[int, str, float]]:
+        """(step, node_id, activation_value) records still buffered, oldest first.
+
+        Integer ids are resolved through ``id_to_name``; ids it does not
+        cover show as their number, as a string.
+        """
+        rows = _ring_rows(self._nodes, self._n_nodes)
+        return list(zip(rows["step"].tolist(), self._names(rows["nid"], self.id_to_name),
+                        rows["act"].tolist()))
+
+    @property
+    def edge_traversals(self) -> List[Tuple[int, str, str, float]]:
+        """(step, edge_src, edge_dst, weight) records still buffered, oldest first."""
+        rows = _ring_rows(self._edges, self._n_edges)
+        names = self.id_to_name
+        return list(zip(rows["step"].tolist(), self._names(rows["src"], names),
+                        self._names(rows["dst"], names), rows["w"].tolist()))
 
     def record_node(self, step: int, node_id: str, activation: float) -> None:
         """Log a node activation at a given spreading step."""
-        self.node_activations.append((step, node_id, round(activation, 4)))
+        if not TRACING_ENABLED:
+            return
+        n = self._n_nodes
+        if n >= self._nodes.shape[0]:
+            self._nodes = _ring_reserve(self._nodes, n)
+        _put_node(self._nodes, n, step, self._intern(node_id), activation)
+        self._n_nodes = n + 1
+
+    def record_node_id(self, step: int, nid: int, activation: float) -> None:
+        """Log a node activation by caller-side integer id *nid* (>= 0).
+
+        The id is resolved only when read, through ``id_to_name``.
+        """
+        if not TRACING_ENABLED:
+            return
+        n = self._n_nodes
+        if n >= self._nodes.shape[0]:
+            self._nodes = _ring_reserve(self._nodes, n)
+        # stored as ~nid so it cannot collide with interned indices
+        _put_node(self._nodes, n, step, ~nid, activation)
+        self._n_nodes = n + 1
 
     def record_edge(self, step: int, src: str, dst: str, weight: float) -> None:
         """Log an edge traversal at a given spreading step."""
-        self.edge_traversals.append((step, src, dst, round(weight, 4)))
-
-    def pretty_print(self) -> str:
-        """Return a human-readable multi-line representation."""
-        lines: List[str] = ["─── Thought Trace ───"]
-
-        # Group node activations by step
-        steps_seen: Dict[int, List[Tuple[str, float]]] = {}
-        for step, nid, val in self.node_activations:
-            steps_seen.setdefault(step, []).append((nid, val))
-
-        for step in sorted(steps_seen):
-            lines.append(f"  Step {step}:")
-            for nid, val in steps_seen[step]:
-                bar = "█" * int(val * 20)
-                lines.append(f"    {nid:<20s} act={val:.4f}  {bar}")
-
-        if self.edge_traversals:
-            lines.append("  Edges traversed:")
-            for step, src, dst, w in self.edge_traversals:
-                lines.append(f"    step {step}: {src} ──({w:.2f})──▶ {dst}")
-
-        lines.append(f"  Final concepts : {', '.join(self.final_concepts) if self.final_concepts else '(none)'}")
-        lines.append(f"  Response intent: {self.response_intent or '(none)'}")
-        lines.append("─────────────────────")
-        return "\n".join(lines)
+        if not TRACING_ENABLED:
+            return
+        n = self._n_edges
+        if n >= self._edges.shape[0]:
+            self._edges = _ring_reserve(self._edges, n)
+        _put_edge(self._edges, n, step, self._intern(src), self._intern(dst), weight)
+        self._n_edges = n + 1
+
+    def record_nodes(self, rows: Iterable[Tuple[int, str, float]]) -> None:
+        """Log a batch of (step, node_id, activation) records in one write.
+
+        Callers that produce many records per step should collect them in
+        a local list and hand it over once, rather than calling
+        :meth:`record_node` per record.
+        """
+        if not TRACING_ENABLED:
+            return
+        intern = self._intern
+        block = np.array([(step, intern(nid), act) for step, nid, act in rows],
+                         dtype=_NODE_DTYPE)
+        self._nodes = _ring_extend(self._nodes, self._n_nodes, block)
+        self._n_nodes += block.shape[0]
+
+    def record_edges(self, rows: Iterable[Tuple[int, str, str, float]]) -> None:
+        """Log a batch of (step, src, dst, weight) records in one write."""
+        if not TRACING_ENABLED:
+            return
+        intern = self._intern
+        block = np.array([(step, intern(s), intern(d), w) for step, s, d, w in rows],
+                         dtype=_EDGE_DTYPE)
+        self._edges = _ring_extend(self._edges, self._n_edges, block)
+        self._n_edges += block.shape[0]
+
+    def record_node_ids(self, steps: Sequence[int], nids: Sequence[int], acts: Sequence[float]) -> None:
+        """Log a batch of node activations given as parallel id arrays.
+
+        *nids* are caller-side integer ids (>= 0), resolved through
+        ``id_to_name`` when read; nothing is done per record in Python.
+        """
+        if not TRACING_ENABLED:
+            return
+        block = np.empty(len(steps), dtype=_NODE_DTYPE)
+        block["step"] = steps
+        block["nid"] = ~np.asarray(nids, dtype=np.int32)
+        block["act"] = acts
+        self._nodes = _ring_extend(self._nodes, self._n_nodes, block)
+        self._n_nodes += block.shape[0]
+
+    def record_edge_ids(
+        self,
+        steps: Sequence[int],
+        srcs: Sequence[int],
+        dsts: Sequence[int],
+        weights: Sequence[float],
+    ) -> None:
+        """Log a batch of edge traversals given as parallel id arrays."""
+        if not TRACING_ENABLED:
+            return
+        block = np.empty(len(steps), dtype=_EDGE_DTYPE)
+        block["step"] = steps
+        block["src"] = ~np.asarray(srcs, dtype=np.int32)
+        block["dst"] = ~np.asarray(dsts, dtype=np.int32)
+        block["w"] = weights
+        self._edges = _ring_extend(self._edges, self._n_edges, block)
+        self._n_edges += block.shape[0]
+
+    def pretty_print(self, id_to_name: Optional[Sequence[str]] = None) -> str:
+        """Return a human-readable multi-line representation.
+
+        *id_to_name* (default: the trace's own ``id_to_name``) maps integer
+        node ids to display names; ids it does not cover print as numbers.
+
+        The text is cached until a record is added, the final concepts or
+        intent change, or a different *id_to_name* object is used (the
+        table itself is assumed not to change).
+        """
+        if id_to_name is None:
+            id_to_name = self.id_to_name
+        # record counts only grow, so together they act as a write epoch
+        key = (self._n_nodes, self._n_edges, tuple(self.final_concepts), self.response_intent)
+        if key != self._cache_key or id_to_name is not self._cache_names:
+            self._cache_text = "\n".join(self._iter_lines(id_to_name))
+            self._cache_key = key
+            self._cache_names = id_to_name
+        return self._cache_text
+
+    def write_pretty(self, fh: TextIO, id_to_name: Optional[Sequence[str]] = None) -> None:
+        """Stream the :meth:`pretty_print` text to *fh*, line by line.
+
+        Large traces are written without first building the whole string.
+        The output ends with a newline.
+        """
+        if id_to_name is None:
+            id_to_name = self.id_to_name
+        fh.writelines(line + "\n" for line in self._iter_lines(id_to_name))
+
+    # ── private helpers ──────────────────────────────────────────────────
+
+    def _iter_lines(self, id_to_name: Sequence[str] = ()) -> Iterator[str]:
+        """Yield the lines of the pretty-printed trace."""
+        yield "─── Thought Trace ───"
+
+        # Group node activations by step.  The engine records them in step
+        # order, so splitting the rows where the step changes usually
+        # suffices; out-of-order traces are stable-sorted first to keep
+        # recording order per step.
+        nodes = _ring_rows(self._nodes, self._n_nodes)
+        steps = nodes["step"]
+        gaps = steps[1:] - steps[:-1]
+        if np.count_nonzero(gaps < 0):
+            nodes = nodes[np.argsort(steps, kind="stable")]
+            steps = nodes["step"]
+            gaps = steps[1:] - steps[:-1]
+        edges = _ring_rows(self._edges, self._n_edges)
+        n, m = nodes.shape[0], edges.shape[0]
+        # every stored id (nodes, then edge sources, then targets) in one pass
+        names = self._names(np.concatenate((nodes["nid"], edges["src"], edges["dst"])), id_to_name)
+
+        # Bar cells are int(round(act, 4) * 20), clamped to 0..20.  Rounding
+        # moves act by at most 5e-5 (1e-3 cells), so only values that close
+        # to a cell boundary - but not on it - need Python's round; the
+        # rest go in bulk.
+        acts = nodes["act"]
+        scaled = acts * 20
+        cells = np.minimum(np.maximum(scaled.astype(np.intp), 0), 20).tolist()
+        act_list = acts.tolist()
+        near = np.abs(np.abs(scaled - np.rint(scaled)) - 1e-3) < 1e-3
+        for i in near.nonzero()[0].tolist() if np.count_nonzero(near) else ():
+            k = int(round(act_list[i], 4) * 20)
+            cells[i] = 0 if k < 0 else 20 if k > 20 else k
+        # "%.4f" prints act exactly as it prints round(act, 4)
+        bars = self._BARS
+        args: List[object] = [None] * (3 * n)
+        args[0::3] = names[:n]
+        args[1::3] = act_list
+        args[2::3] = [bars[k] for k in cells]
+
+        # each step is rendered with one %-format of a template sized to it
+        step_list = steps.tolist()
+        starts = [0] + (gaps.nonzero()[0] + 1).tolist() if n else []
+        for lo, hi in zip(starts, starts[1:] + [n]):
+            yield _step_template(hi - lo) % (step_list[lo], *args[3 * lo:3 * hi])
+
+        if m:
+            yield "  Edges traversed:"
+            rows: List[object] = [None] * (4 * m)
+            rows[0::4] = edges["step"].tolist()
+            rows[1::4] = names[n:n + m]
+            # traces repeat a few graph weights; _weight_text caches their text
+            rows[2::4] = list(map(_weight_text, edges["w"].tolist()))
+            rows[3::4] = names[n + m:]
+            # formatted in blocks, so write_pretty still streams large traces
+            for lo in range(0, m, 256):
+                hi = min(lo + 256, m)
+                yield _edge_template(hi - lo) % tuple(rows[4 * lo:4 * hi])
+
+        yield f"  Final concepts : {', '.join(self.final_concepts) if self.final_concepts else '(none)'}"
+        yield f"  Response intent: {self.response_intent or '(none)'}"
+        yield "─────────────────────"
+
+    def _names(self, col: np.ndarray, id_to_name: Sequence[str]) -> List[str]:
+        """Resolve a column of stored node ids to display names.
+
+        Non-negative ids index the interned table; ``~nid`` entries are
+        caller-side ids looked up in *id_to_name* (or printed as numbers).
+        """
+        ids = self._id_list
+        if not col.size:
+            return []
+        n_ext = len(id_to_name)
+        if col.max() < 0:
+            # caller-side ids only (the engine's case)
+            nids = (~col).tolist()
+            try:
+                # all ids >= 0 here, so only a too-short table can raise
+                return list(itemgetter(*nids)(id_to_name)) if len(nids) > 1 else [id_to_name[nids[0]]]
+            except IndexError:
+                return [id_to_name[i] if i < n_ext else str(i) for i in nids]
+        return [
+            ids[i] if i >= 0 else (id_to_name[~i] if ~i < n_ext else str(~i))
+            for i in col.tolist()
+        ]
+
+    def _intern(self, name: str) -> int:
+        """Return the id-table index of *name*, adding it if new."""
+        idx = self._id_table.get(name)
+        if idx is None:
+            idx = self._id_table[name] = len(self._id_list)
+            self._id_list.append(name)
+        return idx
+
+
+class _NullTrace(ThoughtTrace):
+    """A ThoughtTrace whose ``record_*`` methods discard their input.
+
+    Hand ``ThoughtTrace.NULL`` to code that records unconditionally when no
+    trace is wanted.  It is shared, so never return it as a turn's trace.
+    """
+
+    __slots__ = ()
+
+    def record_node(self, step: int, node_id: str, activation: float) -> None:
+        """No-op."""
+
+    def record_node_id(self, step: int, nid: int, activation: float) -> None:
+        """No-op."""
+
+    def record_edge(self, step: int, src: str, dst: str, weight: float) -> None:
+        """No-op."""
+
+    def record_nodes(self, rows: Iterable[Tuple[int, str, float]]) -> None:
+        """No-op."""
+
+    def record_edges(self, rows: Iterable[Tuple[int, str, str, float]]) -> None:
+        """No-op."""
+
+    def record_node_ids(self, steps: Sequence[int], nids: Sequence[int], acts: Sequence[float]) -> None:
+        """No-op."""
+
+    def record_edge_ids(
+        self,
+        steps: Sequence[int],
+        srcs: Sequence[int],
+        dsts: Sequence[int],
+        weights: Sequence[float],
+    ) -> None:
+        """No-op."""
+
+
+ThoughtTrace.NULL = _NullTrace()
@@ -0,0 +1,47 @@
+"""Build script for the NCE's optional C extensions.
+
+Build them in place with:
+
+    python setup.py build_ext --inplace
+
+Nothing here is required at runtime: every extension is built with
+``optional=True``, so a failed compile only warns, and when an extension
+is missing the pure-Python / Numba / NumPy fallbacks are used.
+"""
+
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:  # Cython not installed: build nothing
+    ext_modules = []
+else:
+    import numpy as np
+
+    ext_modules = cythonize(
+        [
+            Extension(
+                "nce._spread",
+                ["nce/_spread.pyx"],
+                extra_compile_args=["-O3"],
+            ),
+            Extension(
+                "nce._utils_fast",
+                ["nce/_utils_fast.pyx"],
+                include_dirs=[np.get_include()],
+                define_macros=[("NPY_NO_DEPRECATED_API", "NPY_1_7_API_VERSION")],
+            ),
+        ],
+        language_level=3,
+    )
+    # A failed compile (no compiler, MSVC vs GCC flags, ...) only warns.
+    # Set after cythonize(), which does not carry ``optional`` over.
+    for ext in ext_modules:
+        ext.optional = True
+
+setup(
+    name="nce",
+    packages=["nce"],
+    install_requires=["numpy"],
+    ext_modules=ext_modules,
+)